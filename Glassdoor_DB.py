@@ -1,31 +1,29 @@
-import mysql.connector
+import mysql_writer
 import config as CFG
-import pandas as pd
+from skill_dictionary import SkillDictionary
 
 
 def create_db():
     """Creating the glassdoor database and tables"""
 
     # Creating the Glassdoor database
-    mydb = mysql.connector.connect(
-        host=CFG.HOST,
-        user=CFG.USER,
-        passwd=CFG.PASSWORD)
+    mydb = mysql_writer.server_connection()
 
     # creating a cursor
     my_cursor = mydb.cursor()
 
     my_cursor.execute(f"CREATE DATABASE {CFG.DB}")
+    mydb.close()
 
     # Connecting to our created database and creating the tables
+    with mysql_writer.pooled_connection() as mydb:
+        _create_tables(mydb)
 
-    # Connecting to the database -
-    mydb = mysql.connector.connect(
-        host=CFG.HOST,
-        user=CFG.USER,
-        passwd=CFG.PASSWORD,
-        database=CFG.DB)
 
+def _create_tables(mydb):
+    """Creating the glassdoor tables and loading the skills list
+    :param mydb: mysql db connection to the glassdoor database
+    """
     # creating a cursor
     my_cursor = mydb.cursor()
 
@@ -78,8 +76,15 @@ def create_db():
     my_cursor.execute("""CREATE TABLE skills (
                      skill_id INT AUTO_INCREMENT,
                      skill_name VARCHAR(100),
+                     UNIQUE(skill_name),
                      PRIMARY KEY(skill_id)) """)
 
+    my_cursor.execute("""CREATE TABLE skill_aliases (
+                     alias VARCHAR(100),
+                     skill_id INT NOT NULL,
+                     FOREIGN KEY(skill_id) REFERENCES skills(skill_id),
+                     PRIMARY KEY(alias)) """)
+
     my_cursor.execute("""CREATE TABLE skills_in_job (
                      job_id BIGINT,
                      FOREIGN KEY(job_id) REFERENCES job_reqs(job_id),
@@ -87,18 +92,8 @@ def create_db():
                      FOREIGN KEY(skill_id) REFERENCES skills(skill_id),
                      PRIMARY KEY(job_id, skill_id)) """)
 
-    bag_of_words = pd.read_csv('bag_of_words.csv')
-    bag_of_words = bag_of_words['Skill'].str.lower().values
-    df_skill_list = pd.Series(bag_of_words).reset_index().rename(columns={0: 'skill_name'})
-    for i in range(len(df_skill_list)):
-        row = df_skill_list.loc[i, :].tolist()
-        row[0] = int(row[0])
-        my_cursor.execute("""INSERT IGNORE INTO skills (
-                                  skill_id, skill_name)
-                                VALUES (%s, %s)""", row)
-        if i % 1000 == 0:
-            mydb.commit()
     mydb.commit()
+    SkillDictionary(mydb).seed()
 
 
 def main():
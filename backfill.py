@@ -0,0 +1,69 @@
+import pandas as pd
+import config as CFG
+from gd_jobs import GDJobs
+import mysql_writer
+
+"""
+Backfill of GlassdoorDB out of archived scrape files (glassdoor_jobs*.csv saved by the scrape command).
+
+The files are streamed in chunks of CFG.BACKFILL_CHUNK_SIZE rows, so memory does not grow with the size or number
+of the files. Job posts already in job_reqs, loaded by an earlier chunk, file or run, are dropped before anything
+else is done with them: job_reqs and skills_in_job are written in one transaction, so a job in job_reqs is fully
+loaded. Each chunk is then bulk loaded like a fresh scrape, reusing the cached enrichment.
+"""
+
+
+def iter_chunks(jobs_files, chunk_size=CFG.BACKFILL_CHUNK_SIZE):
+    """
+    Generator of the rows of the archived scrape files, chunk after chunk
+    :param jobs_files: csv files saved by the scrape command
+    :param chunk_size: number of rows per chunk
+    :return: yields (file name, df of chunk_size rows at most)
+    """
+    for jobs_file in jobs_files:
+        CFG.logger.info(f'backfill of {jobs_file} started')
+        for chunk in pd.read_csv(jobs_file, index_col=0, chunksize=chunk_size):
+            yield jobs_file, chunk
+
+
+def _new_jobs(mydb, chunk):
+    """
+    Drops the job posts of a chunk without a job id, repeated in the chunk or already in the job_reqs table
+    :param mydb: mysql db connection
+    :param chunk: df of job posts
+    :return: df of the job posts to load, with a fresh index
+    """
+    chunk = chunk.assign(Job_ID=pd.to_numeric(chunk['Job_ID'], errors='coerce'))
+    chunk = chunk.dropna(subset=['Job_ID']).astype({'Job_ID': 'int64'}).drop_duplicates('Job_ID')
+    if chunk.empty:
+        return chunk.reset_index(drop=True)
+    job_ids = chunk['Job_ID'].tolist()
+    my_cursor = mydb.cursor()
+    my_cursor.execute(f"""SELECT job_id FROM job_reqs WHERE job_id IN ({', '.join(['%s'] * len(job_ids))})""",
+                      job_ids)
+    loaded = {job_id for job_id, in my_cursor.fetchall()}
+    return chunk[~chunk['Job_ID'].isin(loaded)].reset_index(drop=True)
+
+
+def backfill(jobs_files, chunk_size=CFG.BACKFILL_CHUNK_SIZE):
+    """
+    This function loads archived scrape files to GlassdoorDB chunk by chunk, skipping job posts already loaded
+    :param jobs_files: csv files saved by the scrape command
+    :param chunk_size: number of rows per chunk
+    :return: number of job posts loaded
+    """
+    total = 0
+    for jobs_file, chunk in iter_chunks(jobs_files, chunk_size):
+        with mysql_writer.pooled_connection() as mydb:
+            new_jobs = _new_jobs(mydb, chunk)
+        if new_jobs.empty:
+            continue
+        gd_jobs = GDJobs(new_jobs)
+        if 'Country' in new_jobs and 'HQ Country' in new_jobs:
+            gd_jobs.fill_missing()
+        else:
+            gd_jobs.enrich()
+        mysql_writer.load_to_mysql(gd_jobs)
+        total += len(new_jobs)
+        CFG.logger.info(f'{len(new_jobs)} job posts of {jobs_file} loaded, {total} in total')
+    return total
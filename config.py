@@ -1,7 +1,8 @@
 import logging
+import os
 import sys
+import threading
 from datetime import datetime
-from selenium import webdriver
 
 PATH_OF_CHROME_DRIVER = 'chromedriver_linux64/chromedriver'
 JOBS_IN_ISRAEL = 'https://www.glassdoor.com/Job/israel-jobs-SRCH_IL.0,6_IN119.htm?fromAge=1&radius=25'
@@ -26,17 +27,52 @@ USER = "root"
 PASSWORD = "**"
 DB = "GlassdoorDB"
 COMMIT_ITER = 1000
-CHROME_OPTIONS = webdriver.ChromeOptions()
-# CHROME_OPTIONS.add_argument('--no-sandbox')
-# CHROME_OPTIONS.add_argument('--headless')
-# CHROME_OPTIONS.add_argument('--disable-dev-shm-usage')
-CHROME_OPTIONS.add_argument("--incognito")
-logger = logging.getLogger("glassdoor_scraper")
-logger.setLevel(logging.DEBUG)
-file_handler = logging.FileHandler(f'GDScraper_{datetime.now()}.log')
-file_handler.setLevel(logging.DEBUG)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
-logger.addHandler(logging.StreamHandler(sys.stdout))
+ENRICH_CACHE_SIZE = 4096
+BACKFILL_CHUNK_SIZE = 500
+POOL_NAME = "glassdoor_pool"
+POOL_SIZE = 4
+POOL_TIMEOUT = 60
+SKILLS_FILE = 'bag_of_words.csv'
+SKILL_ALIASES_FILE = 'skill_aliases.csv'
+SKILLS_LOOKUP_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), f'skills_lookup_{HOST}_{DB}.json')
+LOGGER_NAME = "glassdoor_scraper"
 
+
+def _chrome_options():
+    """Builds the chrome options of the scraper webdriver"""
+    from selenium import webdriver
+    chrome_options = webdriver.ChromeOptions()
+    # chrome_options.add_argument('--no-sandbox')
+    # chrome_options.add_argument('--headless')
+    # chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument("--incognito")
+    return chrome_options
+
+
+def _logger():
+    """Builds the scraper logger, writing to a timestamped log file and to stdout"""
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(logging.DEBUG)
+    file_handler = logging.FileHandler(f'GDScraper_{datetime.now()}.log')
+    file_handler.setLevel(logging.DEBUG)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_handler.setFormatter(formatter)
+    logger.addHandler(file_handler)
+    logger.addHandler(logging.StreamHandler(sys.stdout))
+    return logger
+
+
+# objects that are slow to build or have side effects (importing selenium, opening a log file) are built only
+# on first access of CFG.<name>, so commands that do not use them start fast
+_LAZY = {'CHROME_OPTIONS': _chrome_options, 'logger': _logger}
+_LAZY_LOCK = threading.Lock()
+
+
+def __getattr__(name):
+    """Builds the lazy object called name on its first access, and keeps it as a module attribute"""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _LAZY_LOCK:
+        if name not in globals():
+            globals()[name] = _LAZY[name]()
+    return globals()[name]
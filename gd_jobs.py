@@ -0,0 +1,339 @@
+from functools import lru_cache
+import pandas as pd
+import numpy as np
+import requests
+from geopy import Nominatim
+from geopy.exc import GeocoderUnavailable
+import config as CFG
+import skill_dictionary
+
+"""
+In this module we hold the data frame of scraped Glassdoor job posts, enrich it with country and location
+information and load it to the mysql db.
+
+It needs neither selenium nor a chrome driver, so data frames saved by earlier scrapes can be enriched and loaded
+without starting a browser.
+"""
+
+
+class GDJobs:
+    """
+    Class for enriching Glassdoor job posts data and loading it to mysql db
+    Attributes:
+        df: data frame of job posts, one row per job post
+    """
+
+    def __init__(self, df=None):
+        """Initialize a GDJobs object with a data frame of job posts"""
+        self.df = pd.DataFrame() if df is None else df
+
+    def enrich(self):
+        """
+        This method deals with the object df, adding Country, HQ Country and replace missing values
+        :return: df with added info and fixed missing values to be accepted by mysql
+        """
+        glassdoor_jobs = self.df
+        glassdoor_jobs['Country'] = glassdoor_jobs['Location'].apply(find_country)
+        glassdoor_jobs['HQ Country'] = glassdoor_jobs['Headquarters'].apply(find_country)
+        return self.fill_missing()
+
+    def fill_missing(self):
+        """
+        This method replaces the missing values of the object df
+        :return: df with fixed missing values to be accepted by mysql
+        """
+        glassdoor_jobs = self.df
+        glassdoor_jobs['Company_Rating'] = glassdoor_jobs['Company_Rating'].fillna(-99)
+        self.df = glassdoor_jobs.astype(object).fillna("None")  # for mysql usage
+        return self.df
+
+    @staticmethod
+    def _location_id_column(mydb, countries, cities):
+        """
+        This method fetches the ids of the given locations, querying only the (country, city) pairs given,
+        so the cost does not grow with the size of the locations table.
+        Rows are matched back to the pairs by lower case country and city, variants that the mysql collation
+        merges and lower case does not (accents, trailing spaces) are not found.
+        :param mydb: mysql db connection
+        :param countries: series of countries
+        :param cities: series of cities
+        :return: object series of the location id of each country and city, None for locations not found
+        """
+        pairs = [(str(country), str(city)) for country, city in zip(countries, cities)]
+        unique_pairs = list(set(pairs))
+        location_ids = {}
+        if unique_pairs:
+            my_cursor = mydb.cursor()
+            my_cursor.execute(f"""SELECT country, city, id FROM locations
+                                  WHERE (country, city) IN ({', '.join(['(%s, %s)'] * len(unique_pairs))})""",
+                              [value for pair in unique_pairs for value in pair])
+            location_ids = {(country.lower(), city.lower()): location_id
+                            for country, city, location_id in my_cursor.fetchall()}
+        return pd.Series([location_ids.get((country.lower(), city.lower())) for country, city in pairs],
+                         index=countries.index, dtype=object)
+
+    @staticmethod
+    def long_lat_dict(dataframe):
+        """
+        Receives a dataframe and returns a dictionary with the unique latitude/longitude for each location
+        :param dataframe: Glassdoor jobs data frame with locations and countries
+        """
+
+        unique_locations = set(pd.concat([dataframe['Location'], dataframe['Country']]))
+        coords_dict = {}
+        for loc in unique_locations:
+            if loc == np.nan or loc == 'None':
+                coords_dict[loc] = ('', '')
+            else:
+                try:
+                    location = geocode(loc)
+                except GeocoderUnavailable:
+                    CFG.logger.warning(f'No response from Geocoder')
+                    location = None
+                if location is not None:
+                    coords_dict[loc] = (location.longitude, location.latitude)
+        return coords_dict
+
+    @staticmethod
+    def add_lon_lat(row, coords_dict):
+        """For each row, adds its longitude and latitude
+        :param row: row of Glassdoor data frame, Location and Country columns are mandatory
+        :param coords_dict: dictionary of all locations in the object df and their coordinates
+        :return: coordinates of the location in the row
+        """
+        if row['Location'] in coords_dict:
+            longitude, latitude = coords_dict[row['Location']]
+            return longitude, latitude
+        else:
+            longitude, latitude = coords_dict[row['Country']]
+            return longitude, latitude
+
+    @staticmethod
+    @lru_cache(maxsize=CFG.ENRICH_CACHE_SIZE)
+    def get_extra_country_info(country):
+        """
+        This method takes a country name and using restcountries api return countries population, capital city and
+        region, answers are cached so each country is requested once
+        :param country: country name
+        :return: A dictionary with population of the given country, capital of the given country
+        and the region of the given country
+        """
+        response = requests.get(CFG.REST_COUNTRIES_A + country + CFG.REST_COUNTRIES_B)
+        country_info = response.json()
+        if isinstance(country_info, dict):
+            population = None
+            capital = None
+            region = None
+        else:
+            population = country_info[0]['population']
+            capital = country_info[0]['capital']
+            region = country_info[0]['region']
+        return {'Population': population, 'Capital': capital, 'Region': region}
+
+    def enrich_locations(self, mydb=None):
+        """This method enriches the data with coordinates, and country information and inserts it to location table in
+        mysql db
+        :param mydb: mysql db connection, if given locations already in the locations table are not enriched again
+        :return: df of the location with new country information
+         """
+        glassdoor_jobs = self.df
+        df_location = pd.DataFrame()
+        df_location['Location'] = pd.concat([glassdoor_jobs['Location'], glassdoor_jobs['Headquarters']])
+        df_location['Country'] = pd.concat([glassdoor_jobs['Country'], glassdoor_jobs['HQ Country']])
+        df_location.reset_index(drop=True, inplace=True)
+        df_location['City'] = df_location.apply(lambda x: x['Location'].split(',')[0], axis=1)
+        df_location.drop_duplicates(['Country', 'City'], inplace=True)
+        if mydb is not None:
+            known = self._location_id_column(mydb, df_location['Country'], df_location['City'])
+            df_location = df_location[known.isna()]
+        df_location = df_location.reset_index(drop=True)
+        if df_location.empty:
+            return df_location.reindex(columns=['Location', 'Country', 'City', 'Longitude', 'Latitude', 'Region',
+                                                'Population', 'Capital'])
+        coords_dict = self.long_lat_dict(df_location)
+        df_location['Longitude'], df_location['Latitude'] = df_location.apply(lambda x: self.add_lon_lat(
+            x, coords_dict), axis=1).str
+        df_location['Region'] = df_location['Country'].apply(lambda x:
+                                                             self.get_extra_country_info(x)['Region'])
+        df_location['Population'] = df_location['Country'].apply(lambda x:
+                                                                 self.get_extra_country_info(x)['Population'])
+        df_location['Capital'] = df_location['Country'].apply(lambda x:
+                                                              self.get_extra_country_info(x)['Capital'])
+        return df_location
+
+    def location_to_mysql(self, mydb, df_location=None):
+        """This method enriches the data with coordinates, and inserts it to location table in mysql db
+         :param mydb: mysql db connection
+         :param df_location: df of the locations already enriched, enriched here if not given
+         """
+        if df_location is None:
+            df_location = self.enrich_locations(mydb)
+        df_location['Population'] = df_location['Population'].fillna(-99).astype(int)
+        df_location = df_location.astype(object).fillna('None')
+        CFG.logger.info('insert into location table started')
+        insert_many(mydb, """INSERT IGNORE INTO locations (
+                             location, country, city, longitude, latitude, region, population, capital)
+                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""", df_location)
+        return
+
+    def company_to_mysql(self, mydb):
+        """
+        This method inserts company data to company table in mysql db
+        :param mydb: mysql db connection
+        """
+        glassdoor_jobs = self.df
+        df_company = pd.DataFrame()
+        df_company['Company_name'] = glassdoor_jobs['Company']
+        df_company['country'] = glassdoor_jobs['HQ Country']
+        df_company['city'] = glassdoor_jobs.apply(lambda x: x['Headquarters'].split(',')[0], axis=1)
+
+        df_company['Size'] = glassdoor_jobs['Size']
+        df_company['Founded'] = glassdoor_jobs['Founded']
+        df_company['Type'] = glassdoor_jobs['Type']
+        df_company['Industry'] = glassdoor_jobs['Industry']
+        df_company['Sector'] = glassdoor_jobs['Sector']
+        df_company['Revenue'] = glassdoor_jobs['Revenue']
+        df_company['Rating'] = glassdoor_jobs['Company_Rating']
+
+        df_company['location_id'] = self._location_id_column(mydb, df_company['country'], df_company['city'])
+        df_company = df_company[['Company_name', 'location_id', 'Size', 'Founded', 'Type', 'Industry', 'Sector',
+                                 'Revenue', 'Rating']]
+
+        CFG.logger.info('insert into company table started')
+        insert_many(mydb, """INSERT IGNORE INTO companies (
+                             company_name, location_id, size, founded, type, industry, sector, revenue, rating)
+                            VALUES (%s, %s, %s, %s,  %s, %s, %s, %s, %s)""", df_company)
+        return
+
+    def jobs_to_mysql(self, mydb, commit=True):
+        """
+        This method inserts jobs data to jobs table in mysql db
+        :param mydb: mysql db connection
+        :param commit: whether to commit the inserts, left to the caller to commit them with other inserts otherwise
+        """
+        df_jobs = pd.DataFrame()
+        glassdoor_jobs = self.df
+        df_jobs['Job_Id'] = glassdoor_jobs['Job_ID']
+        df_jobs['Title'] = glassdoor_jobs['Title']
+        df_jobs['Company'] = glassdoor_jobs['Company']
+        df_jobs['Desc'] = glassdoor_jobs['Desc']
+        df_jobs['Scrape_Date'] = pd.to_datetime(glassdoor_jobs['Scrape_Date'])
+        df_jobs['country'] = glassdoor_jobs['HQ Country']
+        df_jobs['city'] = glassdoor_jobs.apply(lambda x: x['Headquarters'].split(',')[0], axis=1)
+
+        df_jobs['location_id'] = self._location_id_column(mydb, df_jobs['country'], df_jobs['city'])
+        df_jobs.drop(columns=['country', 'city'], inplace=True)
+        missing_id = df_jobs['Job_Id'].isna() | (df_jobs['Job_Id'] == 'None')
+        for i, row in df_jobs[missing_id].iterrows():
+            CFG.logger.info(f'row {i} skipped because non existing job id, missed info:\n{row.tolist()}')
+        df_jobs = df_jobs[~missing_id].astype({'Job_Id': 'int64'})
+
+        CFG.logger.info('insert into jobs table started')
+        insert_many(mydb, """INSERT IGNORE INTO job_reqs (
+                             job_id, title, company, description, scrape_date, location_id)
+                            VALUES (%s, %s, %s, %s, %s, %s)""", df_jobs, commit)
+        return
+
+    def tag_skills(self, mydb):
+        """
+        This method finds the skills of the skill dictionary, by name or alias, mentioned in each job description
+        :param mydb: mysql db connection, used for reading the skills lookup
+        :return: df of job ids and the ids of the skills found in their description
+        """
+        glassdoor_jobs = self.df
+        lookup = skill_dictionary.load_lookup(mydb)
+        tagged = []
+        for index, row in glassdoor_jobs.iterrows():
+            skill_ids = {lookup[word] for word in combinations(row['Desc']) if word in lookup}
+            tagged.extend((row['Job_ID'], skill_id) for skill_id in sorted(skill_ids))
+        df_skills = pd.DataFrame(tagged, columns=['Job_ID', 'Skill_ID'])
+        return df_skills
+
+    def skills_to_mysql(self, mydb, df_skills=None, commit=True):
+        """
+        This method gathers and inserts skills data to skills and skills in jobs db tables
+        :param mydb: mysql db connection
+        :param df_skills: df of job ids and skill ids already tagged, tagged here if not given
+        :param commit: whether to commit the inserts, left to the caller to commit them with other inserts otherwise
+
+        """
+        if df_skills is None:
+            df_skills = self.tag_skills(mydb)
+        CFG.logger.info('insert into skills_in_job table started')
+        insert_many(mydb, """INSERT IGNORE INTO skills_in_job  (
+                             job_id, skill_id)
+                            VALUES (%s, %s)""", df_skills, commit)
+
+
+def insert_many(mydb, query, df, commit=True):
+    """
+    Inserts the rows of a df with a multi row insert per batch of CFG.COMMIT_ITER rows, committing after each batch
+    unless the caller commits.
+    Missing values (NaN, NA) are inserted as NULL.
+    :param mydb: mysql db connection
+    :param query: insert query with a placeholder for each column of the df
+    :param df: df with the columns in the order of the query placeholders
+    :param commit: whether to commit after each batch, left to the caller to commit otherwise
+    """
+    my_cursor = mydb.cursor()
+    df = df.astype(object)  # python types, as mysql connector expects
+    df = df.where(df.notna(), None)
+    rows = list(df.itertuples(index=False, name=None))
+    for start in range(0, len(rows), CFG.COMMIT_ITER):
+        my_cursor.executemany(query, rows[start:start + CFG.COMMIT_ITER])
+        if commit:
+            mydb.commit()
+            CFG.logger.info('committed')
+
+
+@lru_cache(maxsize=CFG.ENRICH_CACHE_SIZE)
+def geocode(location):
+    """
+    This function finds the coordinates of a location using geopy, answers are cached so each location is
+    requested once
+    :param location: the location to find
+    :return: geopy location, None if not found
+    """
+    return Nominatim(user_agent=CFG.GEO_AGENT).geocode(location, timeout=20)
+
+
+@lru_cache(maxsize=CFG.ENRICH_CACHE_SIZE)
+def find_country(location):
+    """
+    This function finds the country of the location using an API
+    :param location: the location to find it's country
+    :return: The country of the given location if found, None otherwise
+    """
+    response = requests.request("GET", CFG.API_URL, headers=CFG.HEADERS, params={'location': location})
+    if len(eval(response.text)['Results']) != 0 and eval(response.text)['Results'][0]['c'] == 'US':
+        country = 'USA'
+    elif len(eval(response.text)['Results']) == 0 and len(location) > 2:
+        response = requests.request("GET", CFG.API_URL, headers=CFG.HEADERS, params={'location': location[:-2]})
+        if len(eval(response.text)['Results']) == 0:
+            if len(location.split(',')) > 1:
+                country = location.split(',')[-1].strip()
+            else:
+                country = None
+        else:
+            # country = eval(response.text)['Results'][0]['c']
+            country = eval(response.text)['Results'][0]['name'].split(',')[-1].strip()
+
+    else:
+        # country = eval(response.text)['Results'][0]['c']
+        country = eval(response.text)['Results'][0]['name'].split(',')[-1].strip()
+    CFG.logger.debug(country)
+    return country
+
+
+def combinations(description):
+    """
+    Receives a text and returns combinations of words(up to two words together)
+    :param description: text to get word combinations from
+    :return: word combinations gathered from the text
+    """
+    # scikit-learn is slow to import and needed only for skill tagging, so it is imported on first use
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vectorized = TfidfVectorizer(stop_words=['english', 'make'], ngram_range=(1, 2))
+    vectorized.fit_transform([description])
+    combos = vectorized.get_feature_names()
+    return combos
@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import threading
+import time
+import mysql.connector
+from mysql.connector import pooling
+import config as CFG
+import skill_dictionary
+
+"""
+MySQL writer layer of the Glassdoor scraper.
+
+All the connections to GlassdoorDB are taken from one shared connection pool, used both by the database creation
+and by the scraper loaders. Every loading task gets its own connection from the pool, so tasks that do not depend
+on each other can run in parallel threads.
+"""
+
+# connections held at once by load_to_mysql: the insert chain and the two parallel tasks
+LOAD_CONNECTIONS = 3
+PARALLEL_TASKS = 2
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    This function returns the shared connection pool to GlassdoorDB, creating it on first use
+    :return: mysql connection pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if CFG.POOL_SIZE < LOAD_CONNECTIONS:
+                raise ValueError(f'POOL_SIZE must be at least {LOAD_CONNECTIONS}, the connections held at once '
+                                 f'when loading tables, got {CFG.POOL_SIZE}')
+            _pool = pooling.MySQLConnectionPool(pool_name=CFG.POOL_NAME,
+                                                pool_size=CFG.POOL_SIZE,
+                                                host=CFG.HOST,
+                                                user=CFG.USER,
+                                                passwd=CFG.PASSWORD,
+                                                database=CFG.DB)
+            CFG.logger.info(f'Connection pool of size {CFG.POOL_SIZE} created')
+    return _pool
+
+
+@contextmanager
+def pooled_connection():
+    """
+    Context manager that borrows a connection from the pool and returns it to the pool when done.
+    The pool does not wait for a free connection, so while it is exhausted the borrowing is retried,
+    for CFG.POOL_TIMEOUT seconds at most.
+    :return: mysql db connection
+    """
+    pool = get_pool()
+    deadline = time.monotonic() + CFG.POOL_TIMEOUT
+    while True:
+        try:
+            mydb = pool.get_connection()
+            break
+        except mysql.connector.errors.PoolError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+    try:
+        yield mydb
+    finally:
+        mydb.close()  # returns the connection to the pool
+
+
+def server_connection():
+    """
+    This function opens a connection to the mysql server without selecting a database,
+    needed only for creating the database itself, before the pool can connect to it
+    :return: mysql server connection
+    """
+    return mysql.connector.connect(host=CFG.HOST, user=CFG.USER, passwd=CFG.PASSWORD)
+
+
+def _with_connection(loader, *args):
+    """
+    Runs a loader with a connection of its own from the pool
+    :param loader: function or method that takes a mysql db connection as its first argument
+    :param args: additional arguments passed to the loader
+    :return: the loader's return value
+    """
+    with pooled_connection() as mydb:
+        return loader(mydb, *args)
+
+
+def _jobs_and_skills_to_mysql(mydb, gd_jobs, tagging):
+    """
+    Inserts the job_reqs and skills_in_job rows of the jobs in one transaction, so a job in job_reqs is always
+    tagged, and a load that fails leaves neither
+    :param mydb: mysql db connection
+    :param gd_jobs: GDJobs object with a data frame of collected jobs
+    :param tagging: future of the skills tagged in the jobs
+    """
+    try:
+        gd_jobs.jobs_to_mysql(mydb, commit=False)
+        gd_jobs.skills_to_mysql(mydb, tagging.result(), commit=False)
+        mydb.commit()
+        CFG.logger.info('committed')
+    except Exception:
+        mydb.rollback()
+        raise
+
+
+def load_to_mysql(gd_jobs):
+    """
+    This function loads the data frame of the scraper into all GlassdoorDB tables.
+    Location enrichment (network bound) and skill tagging (cpu bound) depend on no table written here,
+    so they run in parallel, while the inserts follow the foreign keys order:
+    locations -> companies -> job_reqs -> skills_in_job, the last two in one transaction.
+    The total time is bounded by the slowest of the two paths instead of the sum of all the stages.
+    :param gd_jobs: GDJobs (or GDScraper) object with a data frame of collected jobs
+    """
+    # fails before any insert if the skill dictionary is not set up, instead of after the first tables are loaded
+    _with_connection(skill_dictionary.load_lookup)
+    with ThreadPoolExecutor(max_workers=PARALLEL_TASKS) as executor:
+        tagging = executor.submit(_with_connection, gd_jobs.tag_skills)
+        enriching = executor.submit(_with_connection, gd_jobs.enrich_locations)
+
+        _with_connection(gd_jobs.location_to_mysql, enriching.result())
+        _with_connection(gd_jobs.company_to_mysql)
+        _with_connection(_jobs_and_skills_to_mysql, gd_jobs, tagging)
+    CFG.logger.info('All tables loaded')
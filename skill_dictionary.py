@@ -0,0 +1,204 @@
+import csv
+import json
+import os
+import threading
+import config as CFG
+
+"""
+Skill dictionary of GlassdoorDB.
+
+The skills table is seeded and extended in bulk, idempotent batches: a skill keeps its skill_id once inserted,
+so the dictionary can be refreshed without recreating the database. Aliases (e.g. "ml" -> "machine learning")
+are kept in the skill_aliases table and point to the skill_id of their skill.
+
+Every method that changes the tables publishes (unless asked not to) a compiled lookup, from skill name or alias to
+skill_id, to a json cache file of the db, which the skill tagging stage reads instead of querying the skills tables.
+"""
+
+_lookup = None
+_lookup_fingerprint = None
+_lookup_lock = threading.Lock()
+
+
+def normalize(term):
+    """
+    Normalizes a skill name or alias the way skill tagging sees the words of job descriptions
+    :param term: skill name or alias
+    :return: lower case term, single spaced
+    """
+    return ' '.join(term.lower().split())
+
+
+class SkillDictionary:
+    """
+    Class for managing the skills and skill aliases tables
+    Attributes:
+        mydb: mysql db connection to GlassdoorDB
+    """
+
+    def __init__(self, mydb):
+        """Initialize a SkillDictionary object with a mysql db connection"""
+        self._mydb = mydb
+
+    def ensure_schema(self):
+        """
+        This method adds what the skill dictionary needs to databases created before it existed:
+        a unique skill name, to upsert by name, and the skill_aliases table
+        """
+        my_cursor = self._mydb.cursor()
+        my_cursor.execute("""SHOW INDEX FROM skills WHERE Column_name = 'skill_name' AND Non_unique = 0""")
+        if not my_cursor.fetchall():
+            my_cursor.execute("""ALTER TABLE skills ADD UNIQUE(skill_name)""")
+        my_cursor.execute("""CREATE TABLE IF NOT EXISTS skill_aliases (
+                         alias VARCHAR(100),
+                         skill_id INT NOT NULL,
+                         FOREIGN KEY(skill_id) REFERENCES skills(skill_id),
+                         PRIMARY KEY(alias)) """)
+        self._mydb.commit()
+
+    def add_skills(self, skill_names, publish=True):
+        """
+        This method inserts the skills missing from the skills table in one batch, skills already in the table keep
+        their skill_id
+        :param skill_names: iterable of skill names
+        :param publish: whether to publish the lookup after the change
+        :return: number of skills given
+        """
+        rows = [(name,) for name in sorted({normalize(name) for name in skill_names if name and name.strip()})]
+        if rows:
+            my_cursor = self._mydb.cursor()
+            my_cursor.executemany("""INSERT INTO skills (skill_name) VALUES (%s)
+                                     ON DUPLICATE KEY UPDATE skill_name = skill_name""", rows)
+            self._mydb.commit()
+        CFG.logger.info(f'{len(rows)} skills upserted')
+        if publish:
+            self.publish()
+        return len(rows)
+
+    def add_aliases(self, aliases, publish=True):
+        """
+        This method inserts or updates aliases of skills in one batch, skills aliased and missing are added first.
+        The skill ids are fetched by skill name in one query, so mysql matches the names with the collation of the
+        skills table.
+        :param aliases: dictionary of alias to skill name
+        :param publish: whether to publish the lookup after the change
+        :return: number of aliases upserted
+        """
+        aliases = {normalize(alias): normalize(skill_name) for alias, skill_name in aliases.items()}
+        rows = []
+        if aliases:
+            self.add_skills(aliases.values(), publish=False)
+            skill_names = sorted(set(aliases.values()))
+            my_cursor = self._mydb.cursor()
+            my_cursor.execute(f"""SELECT skill_name, skill_id FROM skills
+                                  WHERE skill_name IN ({', '.join(['%s'] * len(skill_names))})""", skill_names)
+            skill_ids = {normalize(skill_name): skill_id for skill_name, skill_id in my_cursor.fetchall()}
+            for alias, skill_name in sorted(aliases.items()):
+                if skill_name in skill_ids:
+                    rows.append((alias, skill_ids[skill_name]))
+                else:
+                    CFG.logger.warning(f'Alias {alias} skipped, skill {skill_name} is stored under another form')
+            if rows:
+                my_cursor.executemany("""INSERT INTO skill_aliases (alias, skill_id) VALUES (%s, %s)
+                                         ON DUPLICATE KEY UPDATE skill_id = VALUES(skill_id)""", rows)
+                self._mydb.commit()
+        CFG.logger.info(f'{len(rows)} skill aliases upserted')
+        if publish:
+            self.publish()
+        return len(rows)
+
+    def seed(self, skills_file=CFG.SKILLS_FILE, aliases_file=CFG.SKILL_ALIASES_FILE, publish=True):
+        """
+        This method upserts the skills of the skills csv, and the aliases of the aliases csv if it exists.
+        Running it again only adds what is new in the files.
+        :param skills_file: csv file with a Skill column
+        :param aliases_file: csv file with Alias and Skill columns
+        :param publish: whether to publish the lookup after the change
+        """
+        self.ensure_schema()
+        with open(skills_file, newline='') as csv_file:
+            self.add_skills((row['Skill'] for row in csv.DictReader(csv_file)), publish=False)
+        if os.path.exists(aliases_file):
+            with open(aliases_file, newline='') as csv_file:
+                self.add_aliases({row['Alias']: row['Skill'] for row in csv.DictReader(csv_file)}, publish=False)
+        if publish:
+            self.publish()
+
+    def _check_schema(self):
+        """
+        This method checks the skill dictionary tables exist, without changing them
+        """
+        my_cursor = self._mydb.cursor()
+        my_cursor.execute("""SHOW TABLES LIKE 'skill_aliases'""")
+        if not my_cursor.fetchall():
+            raise RuntimeError("The skill dictionary is not set up in this database, "
+                               f"run 'Glassdoor_Data_mining.py skills --seed {CFG.SKILLS_FILE}' first")
+
+    def fingerprint(self):
+        """
+        This method summarizes the content of the skill dictionary tables, to tell whether a published lookup
+        was compiled out of them
+        :return: list of the skills count, the max skill_id, the aliases count and the sum of the aliases skill_id
+        """
+        self._check_schema()
+        my_cursor = self._mydb.cursor()
+        my_cursor.execute("""SELECT COUNT(*), COALESCE(MAX(skill_id), 0) FROM skills""")
+        skills_count, max_skill_id = my_cursor.fetchone()
+        my_cursor.execute("""SELECT COUNT(*), COALESCE(SUM(skill_id), 0) FROM skill_aliases""")
+        aliases_count, aliases_sum = my_cursor.fetchone()
+        return [int(skills_count), int(max_skill_id), int(aliases_count), int(aliases_sum)]
+
+    def compile(self):
+        """
+        This method builds the lookup of skill tagging out of the skills and skill aliases tables, read only
+        :return: dictionary of normalized skill name or alias to skill_id
+        """
+        self._check_schema()
+        my_cursor = self._mydb.cursor()
+        my_cursor.execute("""SELECT skill_name, skill_id FROM skills""")
+        lookup = {normalize(skill_name): skill_id for skill_name, skill_id in my_cursor.fetchall()}
+        my_cursor.execute("""SELECT alias, skill_id FROM skill_aliases""")
+        for alias, skill_id in my_cursor.fetchall():
+            lookup.setdefault(normalize(alias), skill_id)
+        return lookup
+
+    def publish(self):
+        """
+        This method compiles the lookup and atomically replaces the cache file with it and the fingerprint of the
+        tables, so readers see either the old or the new lookup
+        :return: the published lookup
+        """
+        lookup = self.compile()
+        tmp_file = f'{CFG.SKILLS_LOOKUP_CACHE}.tmp'
+        with open(tmp_file, 'w') as cache_file:
+            json.dump({'fingerprint': self.fingerprint(), 'lookup': lookup}, cache_file)
+        os.replace(tmp_file, CFG.SKILLS_LOOKUP_CACHE)
+        CFG.logger.info(f'Skills lookup of {len(lookup)} terms published')
+        return lookup
+
+
+def load_lookup(mydb):
+    """
+    This function returns the skills lookup of the db. The published lookup is used only if its fingerprint matches
+    the tables, otherwise (db restored, recreated or changed outside SkillDictionary) the lookup is compiled from
+    the tables. Either is kept in memory until the fingerprint changes. This read path never changes the db or the
+    cache file.
+    :param mydb: mysql db connection
+    :return: dictionary of skill name or alias to skill_id
+    """
+    global _lookup, _lookup_fingerprint
+    with _lookup_lock:
+        skill_dictionary = SkillDictionary(mydb)
+        fingerprint = skill_dictionary.fingerprint()
+        if _lookup is None or fingerprint != _lookup_fingerprint:
+            lookup = None
+            if os.path.exists(CFG.SKILLS_LOOKUP_CACHE):
+                with open(CFG.SKILLS_LOOKUP_CACHE) as cache_file:
+                    published = json.load(cache_file)
+                if published.get('fingerprint') == fingerprint:
+                    lookup = published['lookup']
+            if lookup is None:
+                CFG.logger.warning('Published skills lookup is missing or stale, compiled from the tables')
+                lookup = skill_dictionary.compile()
+            _lookup, _lookup_fingerprint = lookup, fingerprint
+        return _lookup
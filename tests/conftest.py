@@ -0,0 +1,10 @@
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# a logger without the timestamped log file, so the tests leave no log files behind
+config.logger = logging.getLogger(config.LOGGER_NAME)
@@ -0,0 +1,51 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+for module in ['numpy', 'requests', 'geopy', 'mysql.connector']:
+    pytest.importorskip(module)
+import backfill
+
+
+class StubDB:
+    """Connection whose job_reqs table holds the given job ids"""
+
+    def __init__(self, loaded_job_ids):
+        self.loaded_job_ids = set(loaded_job_ids)
+        self.queried = []
+
+    def cursor(self):
+        return StubCursor(self)
+
+
+class StubCursor:
+    def __init__(self, db):
+        self._db = db
+        self._result = []
+
+    def execute(self, query, params):
+        assert 'FROM job_reqs WHERE job_id IN' in query
+        self._db.queried.append(list(params))
+        self._result = [(job_id,) for job_id in params if job_id in self._db.loaded_job_ids]
+
+    def fetchall(self):
+        return self._result
+
+
+def test_new_jobs_drops_missing_repeated_and_loaded_ids():
+    """Job posts without id, repeated in the chunk or already in job_reqs are dropped, the others kept in order"""
+    chunk = pd.DataFrame({'Job_ID': [11, None, 'None', 12, 11, 13, '14'],
+                          'Title': ['a', 'b', 'c', 'd', 'e', 'f', 'g']}, index=range(500, 507))
+    mydb = StubDB(loaded_job_ids=[12])
+    new_jobs = backfill._new_jobs(mydb, chunk)
+    assert new_jobs['Job_ID'].tolist() == [11, 13, 14]
+    assert new_jobs['Title'].tolist() == ['a', 'f', 'g']
+    assert new_jobs.index.tolist() == [0, 1, 2]
+    assert mydb.queried == [[11, 12, 13, 14]]
+
+
+def test_new_jobs_without_ids_does_not_query():
+    """A chunk without any job id is dropped without querying the db"""
+    chunk = pd.DataFrame({'Job_ID': [None, 'None'], 'Title': ['a', 'b']})
+    mydb = StubDB(loaded_job_ids=[])
+    assert backfill._new_jobs(mydb, chunk).empty
+    assert mydb.queried == []
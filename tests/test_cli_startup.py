@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+pytest.importorskip('click')
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['selenium', 'pandas', 'sklearn', 'mysql']
+
+# runs the entry point with the arguments given as json, then reports the heavy modules that got imported.
+# mysql_writer is replaced by a stub, so the db commands run without a mysql server
+CLI_SCRIPT = """
+import contextlib, json, sys, types
+mysql_writer = types.ModuleType('mysql_writer')
+mysql_writer.load_to_mysql = lambda gd_jobs: None
+
+
+class StubCursor:
+    def execute(self, *args):
+        pass
+
+    def fetchall(self):
+        return []
+
+
+@contextlib.contextmanager
+def pooled_connection():
+    yield types.SimpleNamespace(cursor=StubCursor)
+
+
+mysql_writer.pooled_connection = pooled_connection
+sys.modules['mysql_writer'] = mysql_writer
+
+import Glassdoor_Data_mining
+try:
+    Glassdoor_Data_mining.cli(json.loads(sys.argv[1]))
+except SystemExit as exit_error:
+    assert not exit_error.code, exit_error.code
+print(json.dumps(sorted({name.split('.')[0] for name in sys.modules} & set(sys.argv[2:]))))
+"""
+
+
+def run_cli(cwd, args):
+    """
+    Runs the entry point in a new interpreter
+    :param cwd: directory to run in
+    :param args: command line arguments
+    :return: stdout of the run and the heavy modules it imported
+    """
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    result = subprocess.run([sys.executable, '-c', CLI_SCRIPT, json.dumps(args), *HEAVY_MODULES], cwd=cwd, env=env,
+                            capture_output=True, text=True, check=True)
+    return result.stdout, json.loads(result.stdout.splitlines()[-1])
+
+
+def test_help_does_not_import_heavy_dependencies(tmp_path):
+    """--help imports none of the heavy dependencies and does not open a log file"""
+    stdout, imported = run_cli(tmp_path, ['--help'])
+    assert 'Usage' in stdout
+    assert imported == []
+    assert not list(tmp_path.glob('GDScraper_*.log'))
+
+
+def test_scrape_is_the_default_command(tmp_path):
+    """Options of the scrape command given without a command, as before the commands existed, run scrape"""
+    stdout, imported = run_cli(tmp_path, ['--IL', '--help'])
+    assert 'scrape [OPTIONS]' in stdout
+    assert imported == []
+
+
+def test_analyze_does_not_import_scraping_dependencies(tmp_path):
+    """analyze imports neither selenium nor scikit-learn"""
+    stdout, imported = run_cli(tmp_path, ['analyze'])
+    assert 'selenium' not in imported
+    assert 'sklearn' not in imported
+
+
+def test_load_does_not_import_scraping_dependencies(tmp_path):
+    """load imports neither selenium nor scikit-learn"""
+    for module in ['pandas', 'numpy', 'requests', 'geopy']:
+        pytest.importorskip(module)
+    jobs_file = tmp_path / 'glassdoor_jobs.csv'
+    jobs_file.write_text(',Job_ID,Company_Rating\n0,1,\n')
+    stdout, imported = run_cli(tmp_path, ['load', str(jobs_file)])
+    assert 'selenium' not in imported
+    assert 'sklearn' not in imported
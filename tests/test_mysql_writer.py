@@ -0,0 +1,122 @@
+import threading
+import time
+import pytest
+
+pytest.importorskip('mysql.connector')
+import mysql_writer
+
+
+class StubPool:
+    """Pool handing out stub connections and recording how many are held at once"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.held = 0
+        self.max_held = 0
+
+    def get_connection(self):
+        with self._lock:
+            self.held += 1
+            self.max_held = max(self.max_held, self.held)
+        return StubConnection(self)
+
+    def release(self):
+        with self._lock:
+            self.held -= 1
+
+
+class StubConnection:
+    def __init__(self, pool):
+        self._pool = pool
+        self.events = []
+
+    def commit(self):
+        self.events.append('commit')
+
+    def rollback(self):
+        self.events.append('rollback')
+
+    def close(self):
+        self._pool.release()
+
+
+class StubJobs:
+    """GDJobs stand-in recording the order the insert stages run in"""
+
+    def __init__(self, fail_skills=False):
+        self.inserts = []
+        self.connections = {}
+        self._fail_skills = fail_skills
+
+    def tag_skills(self, mydb):
+        time.sleep(0.05)  # the slow parallel task, finishing after the first inserts
+        return 'tags'
+
+    def enrich_locations(self, mydb):
+        return 'locations'
+
+    def location_to_mysql(self, mydb, df_location):
+        assert df_location == 'locations'
+        self.inserts.append('locations')
+
+    def company_to_mysql(self, mydb):
+        self.inserts.append('companies')
+
+    def jobs_to_mysql(self, mydb, commit=True):
+        assert not commit
+        self.inserts.append('job_reqs')
+        self.connections['job_reqs'] = mydb
+        mydb.events.append('job_reqs')
+
+    def skills_to_mysql(self, mydb, df_skills, commit=True):
+        assert df_skills == 'tags' and not commit
+        if self._fail_skills:
+            raise ValueError('skills insert failed')
+        self.inserts.append('skills_in_job')
+        self.connections['skills_in_job'] = mydb
+        mydb.events.append('skills_in_job')
+
+
+def test_load_to_mysql_order_and_connections(monkeypatch):
+    """The inserts follow the foreign keys order and the load holds at most LOAD_CONNECTIONS connections"""
+    pool = StubPool()
+    monkeypatch.setattr(mysql_writer, 'get_pool', lambda: pool)
+    monkeypatch.setattr(mysql_writer.skill_dictionary, 'load_lookup', lambda mydb: {})
+    gd_jobs = StubJobs()
+    mysql_writer.load_to_mysql(gd_jobs)
+    assert gd_jobs.inserts == ['locations', 'companies', 'job_reqs', 'skills_in_job']
+    assert 1 <= pool.max_held <= mysql_writer.LOAD_CONNECTIONS
+    assert pool.held == 0
+
+
+def test_load_to_mysql_fails_before_inserts_without_skill_dictionary(monkeypatch):
+    """A db without skill dictionary fails the load before any table is written"""
+    def load_lookup(mydb):
+        raise RuntimeError('The skill dictionary is not set up in this database')
+
+    pool = StubPool()
+    monkeypatch.setattr(mysql_writer, 'get_pool', lambda: pool)
+    monkeypatch.setattr(mysql_writer.skill_dictionary, 'load_lookup', load_lookup)
+    gd_jobs = StubJobs()
+    with pytest.raises(RuntimeError):
+        mysql_writer.load_to_mysql(gd_jobs)
+    assert gd_jobs.inserts == []
+    assert pool.held == 0
+
+
+def test_jobs_and_skills_in_one_transaction(monkeypatch):
+    """job_reqs and skills_in_job are committed together, and rolled back together on failure"""
+    pool = StubPool()
+    monkeypatch.setattr(mysql_writer, 'get_pool', lambda: pool)
+    monkeypatch.setattr(mysql_writer.skill_dictionary, 'load_lookup', lambda mydb: {})
+    gd_jobs = StubJobs()
+    mysql_writer.load_to_mysql(gd_jobs)
+    mydb = gd_jobs.connections['job_reqs']
+    assert gd_jobs.connections['skills_in_job'] is mydb
+    assert mydb.events == ['job_reqs', 'skills_in_job', 'commit']
+
+    gd_jobs = StubJobs(fail_skills=True)
+    with pytest.raises(ValueError):
+        mysql_writer.load_to_mysql(gd_jobs)
+    assert gd_jobs.connections['job_reqs'].events == ['job_reqs', 'rollback']
+    assert pool.held == 0
@@ -0,0 +1,95 @@
+import json
+import re
+import config as CFG
+import skill_dictionary
+from skill_dictionary import SkillDictionary
+
+
+class StubDB:
+    """Connection whose cursors answer the queries of SkillDictionary out of in memory skills and aliases tables"""
+
+    def __init__(self, skills, aliases):
+        self.skills = dict(skills)
+        self.aliases = dict(aliases)
+        self.statements = []
+
+    def cursor(self):
+        return StubCursor(self)
+
+    def commit(self):
+        pass
+
+
+class StubCursor:
+    def __init__(self, db):
+        self._db = db
+        self._result = []
+
+    def execute(self, query, params=()):
+        query = ' '.join(query.split())
+        self._db.statements.append(query)
+        skills = self._db.skills
+        aliases = self._db.aliases
+        if query.startswith('SHOW TABLES'):
+            self._result = [('skill_aliases',)]
+        elif query.startswith('SELECT COUNT(*), COALESCE(MAX'):
+            self._result = [(len(skills), max(skills.values(), default=0))]
+        elif query.startswith('SELECT COUNT(*), COALESCE(SUM'):
+            self._result = [(len(aliases), sum(aliases.values()))]
+        elif query.startswith('SELECT skill_name, skill_id FROM skills WHERE'):
+            # mysql collation: case insensitive
+            wanted = {param.lower() for param in params}
+            self._result = [(name, skill_id) for name, skill_id in skills.items() if name.lower() in wanted]
+        elif query.startswith('SELECT skill_name, skill_id FROM skills'):
+            self._result = list(skills.items())
+        elif query.startswith('SELECT alias, skill_id FROM skill_aliases'):
+            self._result = list(aliases.items())
+        else:
+            raise AssertionError(f'unexpected query {query}')
+
+    def executemany(self, query, rows):
+        query = ' '.join(query.split())
+        self._db.statements.append(query)
+        if query.startswith('INSERT INTO skills '):
+            lowered = {name.lower() for name in self._db.skills}
+            for name, in rows:
+                if name.lower() not in lowered:
+                    self._db.skills[name] = max(self._db.skills.values(), default=0) + 1
+        elif query.startswith('INSERT INTO skill_aliases'):
+            assert 'VALUES (%s, %s)' in query
+            self._db.aliases.update(rows)
+        else:
+            raise AssertionError(f'unexpected query {query}')
+
+    def fetchall(self):
+        return self._result
+
+    def fetchone(self):
+        return self._result[0]
+
+
+def test_add_aliases_resolves_ids_in_one_query(tmp_path, monkeypatch):
+    """Aliases of skills stored under another case are matched by the db and inserted in one multi row insert"""
+    monkeypatch.setattr(CFG, 'SKILLS_LOOKUP_CACHE', str(tmp_path / 'lookup.json'))
+    mydb = StubDB({'Machine Learning': 1}, {})
+    assert SkillDictionary(mydb).add_aliases({'ML': 'machine learning', 'dl': 'deep learning'}) == 2
+    assert mydb.aliases == {'dl': 2, 'ml': 1}
+    id_queries = [query for query in mydb.statements if query.startswith('SELECT skill_name, skill_id FROM skills WHERE')]
+    assert len(id_queries) == 1
+    published = json.loads((tmp_path / 'lookup.json').read_text())
+    assert published['lookup'] == {'machine learning': 1, 'deep learning': 2, 'ml': 1, 'dl': 2}
+
+
+def test_load_lookup_ignores_stale_cache(tmp_path, monkeypatch):
+    """A published lookup whose fingerprint does not match the db is not used"""
+    cache = tmp_path / 'lookup.json'
+    monkeypatch.setattr(CFG, 'SKILLS_LOOKUP_CACHE', str(cache))
+    monkeypatch.setattr(skill_dictionary, '_lookup', None)
+    cache.write_text(json.dumps({'fingerprint': [1, 7, 0, 0], 'lookup': {'python': 7}}))
+    mydb = StubDB({'python': 3}, {})
+    assert skill_dictionary.load_lookup(mydb) == {'python': 3}
+    SkillDictionary(mydb).publish()
+    monkeypatch.setattr(skill_dictionary, '_lookup', None)
+    mydb.statements.clear()
+    assert skill_dictionary.load_lookup(mydb) == {'python': 3}
+    assert not [query for query in mydb.statements if query.startswith('SELECT skill_name')]  # read from the cache